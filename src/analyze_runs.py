@@ -0,0 +1,423 @@
+#!/usr/bin/env python
+"""跨实验运行的离线汇总分析
+
+扫描保存了多次实验结果的目录，按配置参数分组计算聚合指标，例如
+Cubic 与 Reno 在不同 max_queue_size 下的平均带宽占比。
+
+目录结构约定（每次运行一个子目录）：
+    runs/
+      <run_id>/
+        config.json     实验配置，例如 {"cc1": "cubic", "cc2": "reno", "max_queue_size": 150}
+                        可选 "start_time"（客户端启动时间戳）和 "duration"（实验时长，秒），
+                        用于像实验脚本一样截取cwnd时间窗
+        client1.log     流1的iperf3日志（--logfile 输出），client2.log 以此类推
+        cwnd.log        可选，ss 监控得到的 "timestamp,cwnd1,cwnd2..." 日志
+
+用法示例：
+    python src/analyze_runs.py runs --group-by cc1,cc2,max_queue_size \\
+        --metrics flow1_share,jain_fairness --jobs 8 --csv result.csv
+"""
+
+# ---------------------------- 模块导入 ----------------------------
+import argparse
+import json
+import math
+import os
+import re
+
+CACHE_NAME = '.summary_cache.jsonl'          # 每次运行摘要的缓存文件（位于runs目录下）
+SUMMARY_VERSION = 3                          # 修改summarize_run或解析逻辑时递增，使旧缓存失效
+CLIENT_LOG_RE = re.compile(r'^client(\d+)\.log$')
+
+# -------------------------- 日志解析 --------------------------
+def parse_iperf_intervals(logfile, script_compat=False):
+    """解析iperf3日志文件，提取时间带宽数据
+    参数：
+        logfile: 日志文件路径
+        script_compat: 为True时完全按实验脚本3/4中的parse_iperf_intervals解析
+    返回：
+        timeline: 时间点列表（单位秒）
+        bandwidths: 对应带宽值列表(单位Mbps)
+    与实验脚本的差异（script_compat=False时）：
+        1. 脚本只匹配 'Mbits/sec' 行，Kbits/sec、Gbits/sec 的区间会被丢弃；此处接受所有单位并统一换算为Mbps
+        2. 脚本只排除 'sender' 汇总行，'receiver' 汇总行会被当作一个额外的区间采样；此处两者都排除
+        3. 脚本遇到格式错误行时整个文件返回空；此处只跳过该行
+    因此默认得到的平均带宽、占比和公平性指数可能与脚本打印的[结果]略有不同。
+    """
+    timeline, bandwidths = [], []
+    try:
+        with open(logfile, 'r') as f:
+            for line in f:
+                if script_compat:
+                    # 与实验脚本相同的匹配条件和解析方式
+                    if 'sec' in line and 'Mbits/sec' in line and 'sender' not in line:
+                        parts = line.split()
+                        timeline.append(float(parts[2].split('-')[1]))
+                        bandwidths.append(float(parts[6]))
+                    continue
+                # 匹配有效数据行（包含秒和bits/sec，排除汇总行）
+                if 'sec' in line and 'bits/sec' in line and 'sender' not in line and 'receiver' not in line:
+                    parts = line.split()
+                    try:
+                        time_end = float(parts[2].split('-')[1])
+                        bw_val = float(parts[6])
+                        unit = parts[7]
+                    except (IndexError, ValueError):
+                        continue
+                    # 单位统一转换为Mbps
+                    if unit == 'Gbits/sec':
+                        bw_val *= 1000
+                    elif unit == 'Kbits/sec':
+                        bw_val /= 1000
+                    elif unit == 'bits/sec':
+                        bw_val /= 1000000
+                    timeline.append(time_end)
+                    bandwidths.append(bw_val)
+        return timeline, bandwidths
+    except Exception as e:
+        print(f"[ERROR] 解析失败: {str(e)}")
+        return [], []
+
+def parse_cwnd_log(logfile, min_values=2, start_time=None, duration=None):
+    """解析cwnd监控日志
+    每行格式为 "timestamp,cwnd1,cwnd2,..."，无数据时为 "timestamp,NaN"。
+    与实验脚本中的parse_row一致：仅保留至少包含min_values个cwnd值的行
+    （只有1个值时通常是iperf3控制连接），并对多流情况取该时刻的最大cwnd值。
+    参数：
+        start_time: 实验开始的时间戳；给定时时间轴以其为零点，并丢弃之前的采样
+        duration: 实验时长（秒）；给定时只保留 [起点, 起点+duration] 内的采样，
+                  与实验脚本的时间窗过滤一致
+    返回：
+        timeline: 相对起点的时间（秒），未给定start_time时起点为第一个有效采样点
+        cwnds: 对应cwnd值(packets)
+    """
+    timeline, cwnds = [], []
+    try:
+        with open(logfile, 'r') as f:
+            for line in f:
+                parts = line.strip().split(',')
+                try:
+                    timestamp = float(parts[0])
+                    values = [int(v) for v in parts[1:] if v and v != 'NaN']
+                except ValueError:
+                    continue  # 忽略格式错误行
+                if len(values) >= min_values:
+                    timeline.append(timestamp)
+                    cwnds.append(max(values))
+    except Exception as e:
+        print(f"[ERROR] 解析失败: {str(e)}")
+        return [], []
+    if not timeline:
+        return timeline, cwnds
+    samples = sorted(zip(timeline, cwnds))
+    start = samples[0][0] if start_time is None else start_time
+    end = start + duration if duration is not None else math.inf
+    samples = [(t - start, c) for t, c in samples if start <= t <= end]
+    return [t for t, _ in samples], [c for _, c in samples]
+
+# -------------------------- 指标计算 --------------------------
+def jains_fairness(*avgs):
+    """计算Jain公平性指数
+    公式：
+        fairness = (sum x_i)^2 / (n * sum x_i^2)
+    返回：
+        公平性指数(0.0~1.0)，任一流带宽为0时返回0.0
+    """
+    if not avgs or any(a <= 0 for a in avgs):
+        return 0.0
+    return sum(avgs) ** 2 / (len(avgs) * sum(a ** 2 for a in avgs))
+
+def run_files(run_dir):
+    """返回运行目录下参与分析的文件列表（已排序），用于计算缓存签名"""
+    names = [n for n in os.listdir(run_dir)
+             if n == 'config.json' or n == 'cwnd.log' or CLIENT_LOG_RE.match(n)]
+    return sorted(names)
+
+def run_signature(run_dir):
+    """以文件名、大小和修改时间作为运行的签名，任一变化即重新计算"""
+    sig = []
+    for name in run_files(run_dir):
+        st = os.stat(os.path.join(run_dir, name))
+        sig.append([name, st.st_size, st.st_mtime_ns])
+    return sig
+
+def summarize_run(run_dir):
+    """计算单次运行的摘要（配置参数 + 指标），在工作进程中执行
+    指标字段：
+        flow<i>_mbps: 流i平均带宽
+        flow<i>_share: 流i占总带宽比例
+        total_mbps: 总带宽
+        jain_fairness: Jain公平性指数
+        cwnd_mean / cwnd_max: cwnd均值与最大值（存在cwnd.log时，
+                              按config.json中的start_time/duration截取时间窗）
+    """
+    summary = {'run_id': os.path.basename(run_dir)}
+    config = {}
+    config_path = os.path.join(run_dir, 'config.json')
+    if os.path.exists(config_path):
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+        summary.update(config)
+
+    flows = []
+    for name in run_files(run_dir):
+        m = CLIENT_LOG_RE.match(name)
+        if m:
+            _, bw = parse_iperf_intervals(os.path.join(run_dir, name))
+            flows.append((int(m.group(1)), sum(bw) / len(bw) if bw else 0.0))
+    flows.sort()
+    total = sum(avg for _, avg in flows)
+    for idx, avg in flows:
+        summary[f'flow{idx}_mbps'] = avg
+        summary[f'flow{idx}_share'] = avg / total if total > 0 else 0.0
+    if flows:
+        summary['total_mbps'] = total
+        summary['jain_fairness'] = jains_fairness(*[avg for _, avg in flows])
+
+    cwnd_path = os.path.join(run_dir, 'cwnd.log')
+    if os.path.exists(cwnd_path):
+        _, cwnds = parse_cwnd_log(cwnd_path, start_time=config.get('start_time'),
+                                  duration=config.get('duration'))
+        if cwnds:
+            summary['cwnd_mean'] = sum(cwnds) / len(cwnds)
+            summary['cwnd_max'] = max(cwnds)
+    return summary
+
+def _init_worker():
+    """工作进程忽略SIGINT，由主进程统一处理中断并终止进程池"""
+    import signal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _summarize_job(job):
+    """Pool工作函数：返回 (run_id, 签名, 摘要)"""
+    run_id, run_dir, sig = job
+    try:
+        return run_id, sig, summarize_run(run_dir)
+    except Exception as e:
+        print(f"[ERROR] {run_id} 处理失败: {e}")
+        return run_id, sig, None
+
+# -------------------------- 摘要缓存 --------------------------
+def load_cache(cache_path):
+    """读取摘要缓存，返回 {run_id: (签名, 摘要)}，同一run_id以最后一条为准
+    版本号与SUMMARY_VERSION不一致的记录视为过期，直接丢弃。
+    """
+    cache = {}
+    if not os.path.exists(cache_path):
+        return cache
+    with open(cache_path, 'r') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                if entry.get('version') != SUMMARY_VERSION:
+                    continue
+                cache[entry['run_id']] = (entry['sig'], entry['summary'])
+            except (ValueError, KeyError):
+                continue  # 忽略写入中断产生的残缺行
+    return cache
+
+def cache_entry(run_id, sig, summary):
+    """序列化一条缓存记录（JSON Lines中的一行）"""
+    return json.dumps({'version': SUMMARY_VERSION, 'run_id': run_id,
+                       'sig': sig, 'summary': summary}) + '\n'
+
+def compact_cache(cache_path, cache):
+    """重写缓存文件，去掉被覆盖的旧记录和已删除的运行"""
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        for run_id, (sig, summary) in cache.items():
+            f.write(cache_entry(run_id, sig, summary))
+    os.replace(tmp_path, cache_path)
+
+# -------------------------- 分组聚合 --------------------------
+class GroupStats:
+    """流式统计量（Welford算法），无需保存全部样本"""
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+def accumulate(groups, summary, group_by, metrics):
+    """将一条运行摘要累加到分组统计中"""
+    key = tuple(str(summary.get(k, '')) for k in group_by)
+    stats = groups.setdefault(key, {m: GroupStats() for m in metrics})
+    for m in metrics:
+        value = summary.get(m)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            stats[m].add(value)
+
+def iter_runs(runs_dir):
+    """逐个遍历运行目录，避免一次性列出全部运行"""
+    with os.scandir(runs_dir) as it:
+        for entry in it:
+            if entry.is_dir() and not entry.name.startswith('.'):
+                yield entry.name, entry.path
+
+def analyze(runs_dir, group_by, metrics, jobs=None, chunk_size=256, use_cache=True):
+    """扫描runs_dir并返回 {分组键: {指标: GroupStats}}
+    参数：
+        group_by: 分组使用的配置字段列表
+        metrics: 需要聚合的指标字段列表
+        jobs: 并行进程数（默认CPU核数）
+        chunk_size: 同时提交给进程池的最大运行数，也是缓存写盘的间隔
+        use_cache: 是否复用/更新摘要缓存
+    调度方式：维持最多chunk_size个在途任务的滑动窗口，任一任务完成即补充新任务，
+    各块之间没有等待最慢任务的屏障；结果只在主线程中累加。
+    内存占用：在途任务数有上限，分组统计只保存流式统计量；但摘要缓存索引
+    （每次运行一条摘要）和已扫描的run_id集合会整体驻留内存，随运行数量线性增长。
+    只有存在需要重新计算的运行时才启动进程池。
+    """
+    from multiprocessing import Pool  # 延迟导入，report.py 仅复用解析函数时无需加载
+    import queue
+
+    cache_path = os.path.join(runs_dir, CACHE_NAME)
+    cache = load_cache(cache_path) if use_cache else {}
+    seen = set()
+    groups = {}
+    computed = reused = 0
+    pool = None
+    finished = False
+    results = queue.Queue()   # 进程池回调线程只负责把结果放入队列
+    in_flight = 0
+
+    cache_file = open(cache_path, 'a') if use_cache else None
+
+    def collect():
+        """取出一个已完成的结果并累加（阻塞直到有结果）"""
+        nonlocal in_flight, computed
+        run_id, sig, summary = results.get()
+        in_flight -= 1
+        if summary is None:
+            return
+        accumulate(groups, summary, group_by, metrics)
+        computed += 1
+        if cache_file:
+            cache[run_id] = (sig, summary)
+            cache_file.write(cache_entry(run_id, sig, summary))
+            if computed % chunk_size == 0:
+                cache_file.flush()  # 定期写盘，中断后已完成的运行无需重算
+
+    try:
+        for run_id, run_dir in iter_runs(runs_dir):
+            seen.add(run_id)
+            sig = run_signature(run_dir)
+            cached = cache.get(run_id)
+            if cached and cached[0] == sig:
+                accumulate(groups, cached[1], group_by, metrics)
+                reused += 1
+                continue
+
+            if pool is None:
+                pool = Pool(processes=jobs, initializer=_init_worker)  # 首次需要重新计算时才启动进程池
+            while in_flight >= chunk_size:
+                collect()
+            pool.apply_async(_summarize_job, ((run_id, run_dir, sig),), callback=results.put,
+                             error_callback=lambda e, job=(run_id, sig): results.put((*job, None)))
+            in_flight += 1
+        while in_flight:
+            collect()
+        finished = True
+    finally:
+        if pool is not None:
+            if finished:
+                pool.close()
+            else:
+                pool.terminate()  # 异常或Ctrl+C时不再等待未完成的任务
+            pool.join()
+        if cache_file:
+            cache_file.close()  # 关闭时写出已计算的缓存记录
+
+    if use_cache and (computed or set(cache) - seen):
+        compact_cache(cache_path, {k: v for k, v in cache.items() if k in seen})
+    print(f"[STATUS] 共 {computed + reused} 次运行（新计算 {computed}，缓存复用 {reused}）")
+    return groups
+
+# -------------------------- 结果输出 --------------------------
+def format_table(groups, group_by, metrics):
+    """将分组统计整理为表头和行（每个指标输出 mean/std/n）"""
+    header = list(group_by)
+    for m in metrics:
+        header += [f'{m}_mean', f'{m}_std', f'{m}_n']
+    rows = []
+    for key in sorted(groups, key=_sort_key):
+        row = list(key)
+        for m in metrics:
+            s = groups[key][m]
+            if s.count:
+                row += [f'{s.mean:.4f}', f'{s.std:.4f}', str(s.count)]
+            else:
+                row += ['', '', '0']
+        rows.append(row)
+    return header, rows
+
+def _sort_key(key):
+    """分组键排序：数值字段按数值大小排序（如 max_queue_size）"""
+    out = []
+    for v in key:
+        try:
+            out.append((0, float(v), ''))
+        except ValueError:
+            out.append((1, 0.0, v))
+    return out
+
+def print_table(header, rows):
+    widths = [max(len(h), *(len(r[i]) for r in rows)) if rows else len(h)
+              for i, h in enumerate(header)]
+    print('  '.join(h.ljust(w) for h, w in zip(header, widths)).rstrip())
+    for r in rows:
+        print('  '.join(v.ljust(w) for v, w in zip(r, widths)).rstrip())
+
+def write_csv(path, header, rows):
+    import csv
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    print(f"[STATUS] 结果已写入 {path}")
+
+# -------------------------- 主程序逻辑 --------------------------
+def main():
+    parser = argparse.ArgumentParser(description='跨实验运行的分组聚合分析')
+    parser.add_argument('runs_dir', help='保存各次运行的目录')
+    parser.add_argument('--group-by', default='', help='分组字段，逗号分隔，例如 cc1,cc2,max_queue_size')
+    parser.add_argument('--metrics', default='flow1_share,jain_fairness,total_mbps',
+                        help='聚合指标，逗号分隔')
+    parser.add_argument('--jobs', type=int, default=None, help='并行进程数（默认CPU核数）')
+    parser.add_argument('--chunk-size', type=int, default=256, help='最大在途运行数（同时也是缓存写盘间隔）')
+    parser.add_argument('--no-cache', action='store_true', help='忽略并且不更新摘要缓存')
+    parser.add_argument('--csv', help='将结果表写入CSV文件')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.runs_dir):
+        print(f"[ERROR] 目录不存在: {args.runs_dir}")
+        return 1
+    group_by = [k for k in args.group_by.split(',') if k]
+    metrics = [m for m in args.metrics.split(',') if m]
+
+    jobs = max(1, args.jobs) if args.jobs is not None else None
+    groups = analyze(args.runs_dir, group_by, metrics, jobs=jobs,
+                     chunk_size=max(1, args.chunk_size), use_cache=not args.no_cache)
+    header, rows = format_table(groups, group_by, metrics)
+    print_table(header, rows)
+    if args.csv:
+        write_csv(args.csv, header, rows)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""report.py 启动开销基准
+
+在全新解释器中多次运行 `report.py --help`，取启动耗时中位数；
+同时检查导入 report 后没有加载 mininet/matplotlib/pandas/numpy。
+超过阈值或加载了重量级模块时返回非0，可用于防止启动开销回退。
+
+用法：
+    python src/bench_import.py [--repeat 10] [--threshold 0.5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT = os.path.join(SRC_DIR, 'report.py')
+HEAVY_MODULES = ['mininet', 'matplotlib', 'pandas', 'numpy']
+
+def time_startup(repeat):
+    """返回每次 `report.py --help` 的耗时列表（秒）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, REPORT, '--help'], check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def heavy_modules_loaded():
+    """在子进程中导入report，返回被加载的重量级模块"""
+    code = (
+        "import sys; sys.path.insert(0, %r); import report; "
+        "print(','.join(m for m in %r if m in sys.modules))" % (SRC_DIR, HEAVY_MODULES)
+    )
+    out = subprocess.run([sys.executable, '-c', code], check=True,
+                         capture_output=True, text=True).stdout.strip()
+    return [m for m in out.split(',') if m]
+
+def main():
+    parser = argparse.ArgumentParser(description='report.py 启动开销基准')
+    parser.add_argument('--repeat', type=int, default=10, help='重复次数')
+    parser.add_argument('--threshold', type=float, default=0.5, help='启动耗时中位数上限（秒）')
+    args = parser.parse_args()
+
+    timings = time_startup(max(1, args.repeat))
+    median = statistics.median(timings)
+    print(f"[结果] 启动耗时中位数: {median * 1000:.1f} ms（最小 {min(timings) * 1000:.1f} ms，共{len(timings)}次）")
+
+    loaded = heavy_modules_loaded()
+    status = 0
+    if loaded:
+        print(f"[ERROR] 导入report时加载了重量级模块: {', '.join(loaded)}")
+        status = 1
+    if median > args.threshold:
+        print(f"[ERROR] 启动耗时超过阈值 {args.threshold * 1000:.0f} ms")
+        status = 1
+    if status == 0:
+        print("[STATUS] 启动开销检查通过")
+    return status
+
+if __name__ == '__main__':
+    raise SystemExit(main())
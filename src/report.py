@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+"""离线分析/报告入口（无需Mininet和root权限）
+
+读取已有的 iperf3 或 cwnd 日志，重新计算指标并重新绘图，不重新运行仿真。
+matplotlib 仅在需要绘图时才导入，保证命令本身快速启动；
+导入开销可用 src/bench_import.py 检查。
+
+用法示例：
+    python src/report.py iperf /tmp/client1.log /tmp/client2.log --labels Cubic,Reno \\
+        --plot figure/two_tcp_cubic_reno_test.png --title 'Cubic vs Reno Bandwidth Competition'
+    python src/report.py cwnd /tmp/cwnd.log --duration 5 --label 'TCP Cubic' --plot figure/single_tcp_no_loss_test.png
+    python src/report.py cwnd /tmp/cwnd.log --duration 40 --figsize 15x6 --plot figure/single_tcp_with_loss_test.png
+    python src/report.py run runs/<run_id>
+"""
+
+# ---------------------------- 模块导入 ----------------------------
+# 只导入标准库和同目录下的纯标准库模块，重量级依赖在函数内部延迟导入
+import argparse
+import os
+
+from analyze_runs import jains_fairness, parse_cwnd_log, parse_iperf_intervals, summarize_run
+
+FLOW_STYLES = ['b-o', 'g--s', 'm-.^', 'c:d']   # 与实验脚本一致的曲线样式
+
+# -------------------------- 绘图函数 --------------------------
+def _pyplot():
+    """延迟导入matplotlib，并使用无界面后端以便在无显示环境下保存图片"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def plot_bandwidth(flows, labels, out_path, title, limit=100, figsize=(12,6)):
+    """绘制多流带宽变化曲线
+    参数：
+        flows: [(timeline, bandwidths), ...]
+        labels: 各流的图例名称
+        limit: 瓶颈带宽参考线(Mbps)，为0时不绘制
+        figsize: 图片尺寸(英寸)
+    """
+    plt = _pyplot()
+    plt.figure(figsize=figsize)
+    for i, ((t, b), label) in enumerate(zip(flows, labels)):
+        plt.plot(t, b, FLOW_STYLES[i % len(FLOW_STYLES)], label=label, markersize=5)
+    if limit:
+        plt.axhline(limit, color='r', linestyle=':', label=f'{limit:g}Mbps Limit')
+        plt.ylim(0, limit * 1.05)
+    plt.xlabel('Time (seconds)')
+    plt.ylabel('Bandwidth (Mbps)')
+    plt.title(title)
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(out_path)
+    print(f"[STATUS] 图像已保存: {out_path}")
+
+def plot_cwnd(timeline, cwnds, label, out_path, title, figsize=(12,6)):
+    """绘制cwnd随时间变化曲线（脚本1为12x6，脚本2为15x6）"""
+    plt = _pyplot()
+    plt.figure(figsize=figsize)
+    plt.plot(timeline, cwnds, label=label, color='blue')
+    plt.xlabel('Time (s)')
+    plt.ylabel('Congestion Window (packets)')
+    plt.title(title)
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(out_path)
+    print(f"[STATUS] 图像已保存: {out_path}")
+
+# -------------------------- 子命令实现 --------------------------
+def report_iperf(args):
+    """iperf3日志：输出各流平均带宽、总带宽和公平性指数"""
+    labels = args.labels.split(',') if args.labels else []
+    labels += [f'Flow{i + 1}' for i in range(len(labels), len(args.logs))]
+
+    flows, avgs = [], []
+    for logfile in args.logs:
+        if not os.path.exists(logfile):
+            print(f"[ERROR] {logfile}不存在")
+            return 1
+        t, b = parse_iperf_intervals(logfile, script_compat=args.script_compat)
+        flows.append((t, b))
+        avgs.append(sum(b) / len(b) if b else 0)
+
+    for label, avg in zip(labels, avgs):
+        print(f"[结果] {label}平均带宽: {avg:.2f} Mbps")
+    print(f"[结果] 总带宽: {sum(avgs):.2f} Mbps")
+    if len(avgs) > 1:
+        print(f"[结果] 公平性指数: {jains_fairness(*avgs):.4f}")
+
+    if args.plot:
+        plot_bandwidth(flows, labels, args.plot, args.title or 'TCP Bandwidth Allocation',
+                       args.limit, args.figsize)
+    return 0
+
+def report_cwnd(args):
+    """cwnd日志：输出采样数、cwnd均值与最大值"""
+    if not os.path.exists(args.log) or os.path.getsize(args.log) == 0:
+        print("[ERROR] 无有效数据生成！")
+        return 1
+    timeline, cwnds = parse_cwnd_log(args.log, start_time=args.start, duration=args.duration)
+    if not cwnds:
+        print("[ERROR] 有效数据为空！")
+        return 1
+
+    print(f"[结果] 有效采样数: {len(cwnds)}，时长: {timeline[-1]:.2f} s")
+    print(f"[结果] cwnd均值: {sum(cwnds) / len(cwnds):.2f} packets")
+    print(f"[结果] cwnd最大值: {max(cwnds)} packets")
+
+    if args.plot:
+        plot_cwnd(timeline, cwnds, args.label, args.plot, args.title or f'{args.label} cwnd Dynamics',
+                  args.figsize)
+    return 0
+
+def report_run(args):
+    """单次运行目录：输出与 analyze_runs.py 相同的摘要字段"""
+    if not os.path.isdir(args.run_dir):
+        print(f"[ERROR] 目录不存在: {args.run_dir}")
+        return 1
+    for key, value in summarize_run(args.run_dir).items():
+        if isinstance(value, float):
+            value = f'{value:.4f}'
+        print(f"{key}: {value}")
+    return 0
+
+# -------------------------- 主程序逻辑 --------------------------
+def parse_figsize(value):
+    """解析 "宽x高" 形式的图片尺寸，例如 15x6"""
+    try:
+        width, height = (float(v) for v in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'图片尺寸格式应为 宽x高，例如 15x6: {value}')
+    return width, height
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='基于已有日志重新计算指标和绘图（无需Mininet）')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('iperf', help='分析iperf3客户端日志')
+    p.add_argument('logs', nargs='+', help='iperf3 --logfile 输出，每个文件一个流')
+    p.add_argument('--labels', help='各流图例名称，逗号分隔，例如 Cubic,Reno')
+    p.add_argument('--limit', type=float, default=100, help='瓶颈带宽参考线(Mbps)，0表示不绘制')
+    p.add_argument('--script-compat', action='store_true',
+                   help='按实验脚本3/4的方式解析（只统计Mbits/sec行，包含receiver汇总行），复现脚本打印的结果')
+    p.add_argument('--plot', help='输出图片路径')
+    p.add_argument('--title', help='图片标题')
+    p.add_argument('--figsize', type=parse_figsize, default=(12,6), help='图片尺寸(英寸)，宽x高，默认12x6')
+    p.set_defaults(func=report_iperf)
+
+    p = sub.add_parser('cwnd', help='分析cwnd监控日志')
+    p.add_argument('log', help='cwnd日志，每行 "timestamp,cwnd1,cwnd2..."')
+    p.add_argument('--start', type=float, help='实验开始时间戳（默认取第一个有效采样点）')
+    p.add_argument('--duration', type=float, help='实验时长（秒），例如 5 或 40，只保留该时间窗内的采样')
+    p.add_argument('--label', default='TCP Cubic', help='图例名称')
+    p.add_argument('--plot', help='输出图片路径')
+    p.add_argument('--title', help='图片标题')
+    p.add_argument('--figsize', type=parse_figsize, default=(12,6), help='图片尺寸(英寸)，宽x高，默认12x6')
+    p.set_defaults(func=report_cwnd)
+
+    p = sub.add_parser('run', help='输出单次运行目录的摘要')
+    p.add_argument('run_dir', help='包含config.json和日志的运行目录')
+    p.set_defaults(func=report_run)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    raise SystemExit(main())